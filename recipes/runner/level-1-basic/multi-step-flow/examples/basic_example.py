@@ -11,9 +11,85 @@ This script shows how to:
 import argparse
 import sys
 import yaml
+from collections.abc import Iterator
 from pathlib import Path
 
 from arazzo_runner import ArazzoRunner
+from arazzo_runner.models import WorkflowExecutionStatus
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+RECIPE_DIR = Path(__file__).resolve().parent.parent
+WORKFLOW_FILE = RECIPE_DIR / "arazzo" / "workflow.arazzo.yaml"
+OPENAPI_FILE = RECIPE_DIR / "openapi" / "jsonplaceholder.openapi.yaml"
+
+# execute_next_step moves on to the next step after one raises, so a step
+# error has to stop the drive rather than be treated as progress.
+FAILURE_STATUSES = frozenset({WorkflowExecutionStatus.ERROR, WorkflowExecutionStatus.STEP_ERROR})
+
+
+def load_yaml(path: Path) -> dict:
+    """Parse a YAML file, using the libyaml-backed loader when available."""
+    with open(path) as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def declared_step_ids(arazzo_doc: dict, workflow_id: str) -> list[str]:
+    """Return the stepIds of ``workflow_id`` in the order they are declared."""
+    workflow = next(w for w in arazzo_doc["workflows"] if w["workflowId"] == workflow_id)
+    return [step["stepId"] for step in workflow["steps"]]
+
+
+class WorkflowFailedError(RuntimeError):
+    """Raised when a workflow stops on a failure status."""
+
+
+def iter_steps(runner: ArazzoRunner, execution_id: str, max_steps: int = 32) -> Iterator[dict]:
+    """Yield each step result, ending with the ``workflow_complete`` result.
+
+    Raises ``WorkflowFailedError`` as soon as a step errors or the workflow
+    stops with an error, instead of yielding that result, and ``RuntimeError``
+    if it has not finished after ``max_steps`` calls. Callers therefore never
+    need to check a result for failure.
+    """
+    for _ in range(max_steps):
+        result = runner.execute_next_step(execution_id)
+        status = result["status"]
+        if status in FAILURE_STATUSES:
+            step_id = result.get("step_id", "workflow")
+            raise WorkflowFailedError(
+                result.get("error") or f"{step_id} failed with status {status}"
+            )
+        yield result
+        if status == WorkflowExecutionStatus.WORKFLOW_COMPLETE:
+            return
+    raise RuntimeError(f"workflow did not finish within {max_steps} steps")
+
+
+class BufferedOutput:
+    """Collect output lines and write them to stdout in a single call."""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def write(self, line: str = "") -> None:
+        """Queue a line for the next flush."""
+        self.lines.append(line)
+
+    def error(self, line: str) -> None:
+        """Flush queued lines, then print ``line`` immediately."""
+        self.flush()
+        print(line)
+
+    def flush(self) -> None:
+        """Write all queued lines to stdout at once."""
+        if self.lines:
+            sys.stdout.write("\n".join(self.lines) + "\n")
+            sys.stdout.flush()
+            self.lines.clear()
 
 
 def main() -> int:
@@ -21,127 +97,119 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Multi-step workflow example")
     parser.add_argument("--user-id", type=int, default=1, help="User ID to fetch (1-10)")
     args = parser.parse_args()
+    out = BufferedOutput()
     
-    # Define paths
-    workflow_file = Path(__file__).parent.parent / "arazzo" / "workflow.arazzo.yaml"
-    openapi_file = Path(__file__).parent.parent / "openapi" / "jsonplaceholder.openapi.yaml"
-    
-    print("=" * 70)
-    print("Arazzo Multi-Step Workflow Example")
-    print("=" * 70)
-    print()
+    out.write("=" * 70)
+    out.write("Arazzo Multi-Step Workflow Example")
+    out.write("=" * 70)
+    out.write()
     
     # Check files exist
-    if not workflow_file.exists():
-        print(f"Error: Workflow file not found at {workflow_file}")
+    if not WORKFLOW_FILE.exists():
+        out.error(f"Error: Workflow file not found at {WORKFLOW_FILE}")
         return 1
     
-    if not openapi_file.exists():
-        print(f"Error: OpenAPI file not found at {openapi_file}")
+    if not OPENAPI_FILE.exists():
+        out.error(f"Error: OpenAPI file not found at {OPENAPI_FILE}")
         return 1
     
     # Load files
-    print(f"Loading workflow from: {workflow_file}")
+    out.write(f"Loading workflow from: {WORKFLOW_FILE}")
     try:
-        with open(workflow_file) as f:
-            arazzo_doc = yaml.safe_load(f)
-        
-        with open(openapi_file) as f:
-            openapi_spec = yaml.safe_load(f)
+        arazzo_doc = load_yaml(WORKFLOW_FILE)
+        openapi_spec = load_yaml(OPENAPI_FILE)
         
         source_descriptions = {
             "jsonPlaceholderAPI": openapi_spec
         }
         
         runner = ArazzoRunner(arazzo_doc, source_descriptions)
-        print("✓ Workflow loaded successfully")
-        print()
+        out.write("✓ Workflow loaded successfully")
+        out.write()
     except Exception as e:
-        print(f"Failed to load workflow: {e}")
+        out.error(f"Failed to load workflow: {e}")
         return 1
     
     # Execute workflow
-    print(f"Executing workflow for user ID: {args.user_id}")
-    print("-" * 70)
-    print()
+    out.write(f"Executing workflow for user ID: {args.user_id}")
+    out.write("-" * 70)
+    out.write()
     
     try:
         execution_id = runner.start_workflow("getUserContent", {"userId": args.user_id})
         
-        # Execute steps and track progress
-        step_count = 0
-        result = None
-        for _ in range(10):
-            result = runner.execute_next_step(execution_id)
-            
+        # Steps run in declared order, so progress can be numbered up front;
+        # iter_steps raises if the workflow fails
+        steps = declared_step_ids(arazzo_doc, "getUserContent")
+        step_number = {step_id: i for i, step_id in enumerate(steps, start=1)}
+        for result in iter_steps(runner, execution_id):
+            step_id = result.get("step_id")
             if result["status"] == "step_complete":
-                step_count += 1
-                step_id = result.get("step_id", "unknown")
-                print(f"✓ Step {step_count} completed: {step_id}")
-            
-            if result["status"] == "workflow_complete":
-                break
+                # Retries or goto jumps can report steps outside the declared order
+                number = step_number.get(step_id, "?")
+                out.write(f"✓ Step {number}/{len(steps)} completed: {step_id}")
         
-        print()
+        out.write()
         
-        if result["status"] == "workflow_complete":
-            print("✓ Workflow completed successfully")
-            print()
-            
-            # Access step outputs
-            state = runner.execution_states[execution_id]
-            
-            # Step 1: User info
-            user_data = state.step_outputs["fetchUser"]
-            print("Step 1 - User Information:")
-            print(f"  User ID:  {user_data.get('userId')}")
-            print(f"  Username: {user_data.get('username')}")
-            print(f"  Name:     {user_data.get('name')}")
-            print(f"  Email:    {user_data.get('email')}")
-            print()
-            
-            # Step 2: Posts
-            posts_data = state.step_outputs["fetchPosts"]
-            print("Step 2 - User Posts:")
-            print(f"  Total Posts:      {posts_data.get('postCount')}")
-            print(f"  First Post ID:    {posts_data.get('firstPostId')}")
-            print(f"  First Post Title: {posts_data.get('firstPostTitle')}")
-            print()
-            
-            # Step 3: Comments
-            comments_data = state.step_outputs["fetchComments"]
-            print("Step 3 - Post Comments:")
-            print(f"  Comment Count:      {comments_data.get('commentCount')}")
-            print(f"  First Comment From: {comments_data.get('firstCommentEmail')}")
-            print()
-            
-            # Show data flow
-            print("Data Flow Summary:")
-            print("-" * 70)
-            print(f"  Input (userId: {args.user_id})")
-            print(f"    ↓")
-            print(f"  Step 1: Fetched user '{user_data.get('username')}'")
-            print(f"    ↓ (passed userId: {user_data.get('userId')})")
-            print(f"  Step 2: Found {posts_data.get('postCount')} posts")
-            print(f"    ↓ (passed firstPostId: {posts_data.get('firstPostId')})")
-            print(f"  Step 3: Found {comments_data.get('commentCount')} comments")
-            print(f"    ↓")
-            print(f"  Output: Summary generated")
-            print()
-            
-        else:
-            print(f"Workflow failed: {result.get('error')}")
-            return 1
+        out.write("✓ Workflow completed successfully")
+        out.write()
+        
+        # Access step outputs
+        step_outputs = runner.execution_states[execution_id].step_outputs
+        
+        # Step 1: User info
+        user_data = step_outputs["fetchUser"]
+        out.write("Step 1 - User Information:")
+        out.write(f"  User ID:  {user_data['userId']}")
+        out.write(f"  Username: {user_data['username']}")
+        out.write(f"  Name:     {user_data['name']}")
+        out.write(f"  Email:    {user_data['email']}")
+        out.write()
+        
+        # Step 2: Posts (the step outputs the raw array; summaries are derived here)
+        posts = step_outputs["fetchPosts"]["posts"]
+        first_post = posts[0]  # Step 3 already read posts[0].id, so it exists
+        out.write("Step 2 - User Posts:")
+        out.write(f"  Total Posts:      {len(posts)}")
+        out.write(f"  First Post ID:    {first_post['id']}")
+        out.write(f"  First Post Title: {first_post['title']}")
+        out.write()
+        
+        # Step 3: Comments
+        comments = step_outputs["fetchComments"]["comments"]
+        first_comment_email = comments[0]["email"] if comments else "-"
+        out.write("Step 3 - Post Comments:")
+        out.write(f"  Comment Count:      {len(comments)}")
+        out.write(f"  First Comment From: {first_comment_email}")
+        out.write()
+        
+        # Show data flow
+        out.write("Data Flow Summary:")
+        out.write("-" * 70)
+        out.write(f"  Input (userId: {args.user_id})")
+        out.write(f"    ↓")
+        out.write(f"  Step 1: Fetched user '{user_data['username']}'")
+        out.write(f"    ↓ (passed userId: {user_data['userId']})")
+        out.write(f"  Step 2: Found {len(posts)} posts")
+        out.write(f"    ↓ (passed firstPostId: {first_post['id']})")
+        out.write(f"  Step 3: Found {len(comments)} comments")
+        out.write(f"    ↓")
+        out.write(f"  Output: Summary generated")
+        out.write()
             
+    except WorkflowFailedError as e:
+        out.error(f"Workflow failed: {e}")
+        return 1
     except Exception as e:
-        print(f"Workflow execution failed: {e}")
+        out.error(f"Workflow execution failed: {e}")
         import traceback
         traceback.print_exc()
         return 1
     
-    print("=" * 70)
-    print("Example completed successfully!")
-    print("=" * 70)
+    out.write("=" * 70)
+    out.write("Example completed successfully!")
+    out.write("=" * 70)
+    out.flush()
     
     return 0
 
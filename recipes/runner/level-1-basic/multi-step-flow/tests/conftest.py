@@ -0,0 +1,91 @@
+"""
+Shared fixtures for the multi-step workflow tests.
+
+The specs are parsed and the runner is built once per test session, no
+matter how many test modules use them.
+"""
+
+from pathlib import Path
+from typing import Final
+
+import pytest
+import requests
+import yaml
+from arazzo_runner import ArazzoRunner
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+RECIPE_DIR: Final[Path] = Path(__file__).resolve().parent.parent
+WORKFLOW_FILE: Final[Path] = RECIPE_DIR / "arazzo" / "workflow.arazzo.yaml"
+OPENAPI_FILE: Final[Path] = RECIPE_DIR / "openapi" / "jsonplaceholder.openapi.yaml"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--reuse-executions",
+        action="store_true",
+        help="reuse workflow results recorded by an earlier run (reset with --cache-clear)",
+    )
+
+
+def _load_yaml(path):
+    """Parse a YAML spec, using the libyaml-backed loader when available."""
+    with open(path) as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+@pytest.fixture(scope="session")
+def workflow_dir():
+    """Get the workflow directory."""
+    return RECIPE_DIR
+
+
+@pytest.fixture(scope="session")
+def arazzo_doc():
+    """Load the Arazzo workflow document."""
+    return _load_yaml(WORKFLOW_FILE)
+
+
+@pytest.fixture(scope="session")
+def openapi_spec():
+    """Load the OpenAPI specification."""
+    return _load_yaml(OPENAPI_FILE)
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """Explicit HTTP session for the runner, closed when the test session ends.
+
+    The runner would otherwise create its own ``requests.Session``; passing
+    one in only makes it explicit and closeable.
+    """
+    with requests.Session() as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def runner(arazzo_doc, openapi_spec, http_session):
+    """Create an ArazzoRunner instance shared by the whole session."""
+    source_descriptions = {
+        "jsonPlaceholderAPI": openapi_spec
+    }
+    return ArazzoRunner(arazzo_doc, source_descriptions, http_client=http_session)
+
+
+@pytest.fixture(autouse=True)
+def _reset_execution_states(request):
+    """Drop finished executions from the shared runner after each test.
+
+    The runner is built once per session, so without this its
+    ``execution_states`` would keep every execution the suite started.
+    Tests that need an execution's outputs later snapshot them first.
+    """
+    if "runner" not in request.fixturenames:
+        yield
+        return
+    runner = request.getfixturevalue("runner")
+    yield
+    runner.execution_states.clear()
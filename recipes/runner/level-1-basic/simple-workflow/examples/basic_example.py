@@ -3,92 +3,191 @@
 Basic example demonstrating Arazzo workflow execution using the Python API.
 """
 
+import argparse
+import requests
 import yaml
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 
 from arazzo_runner import ArazzoRunner
+from arazzo_runner.models import WorkflowExecutionStatus
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+try:
+    import orjson
+
+    def dumps(obj: object) -> str:
+        """Serialize ``obj`` as indented JSON."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    import json
+
+    def dumps(obj: object) -> str:
+        """Serialize ``obj`` as indented JSON."""
+        return json.dumps(obj, indent=2)
+
+RECIPE_DIR = Path(__file__).resolve().parent.parent
+WORKFLOW_FILE = RECIPE_DIR / "arazzo" / "workflow.arazzo.yaml"
+OPENAPI_FILE = RECIPE_DIR / "openapi" / "jsonplaceholder.openapi.yaml"
+
+# execute_next_step moves on to the next step after one raises, so a step
+# error has to end the drive just like the end of the workflow does.
+FAILURE_STATUSES = frozenset({WorkflowExecutionStatus.ERROR, WorkflowExecutionStatus.STEP_ERROR})
+TERMINAL_STATUSES = FAILURE_STATUSES | {WorkflowExecutionStatus.WORKFLOW_COMPLETE}
+
+
+def load_yaml(path: Path) -> dict:
+    """Parse a YAML file, using the libyaml-backed loader when available."""
+    with open(path) as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+def drain_workflow(runner: ArazzoRunner, execution_id: str, max_steps: int = 32) -> dict:
+    """Execute steps until the workflow reaches a terminal status.
+
+    Raises ``RuntimeError`` if it has not stopped after ``max_steps`` calls,
+    rather than looping forever on a workflow that never finishes.
+    """
+    results = map(runner.execute_next_step, repeat(execution_id, max_steps))
+    result = next(filter(lambda r: r["status"] in TERMINAL_STATUSES, results), None)
+    if result is None:
+        raise RuntimeError(f"workflow did not finish within {max_steps} steps")
+    return result
+
+
+def fetch_user(runner: ArazzoRunner, user_id: int) -> tuple[dict, dict | None]:
+    """Run getUserInfo for one user and return the final result and user."""
+    execution_id = runner.start_workflow("getUserInfo", {"userId": user_id})
+    result = drain_workflow(runner, execution_id)
+    state = runner.execution_states[execution_id]
+    return result, state.step_outputs.get("fetchUser")
+
+
+class BufferedOutput:
+    """Collect output lines and write them to stdout in a single call."""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def write(self, line: str = "") -> None:
+        """Queue a line for the next flush."""
+        self.lines.append(line)
+
+    def error(self, line: str) -> None:
+        """Flush queued lines, then print ``line`` immediately."""
+        self.flush()
+        print(line)
+
+    def flush(self) -> None:
+        """Write all queued lines to stdout at once."""
+        if self.lines:
+            sys.stdout.write("\n".join(self.lines) + "\n")
+            sys.stdout.flush()
+            self.lines.clear()
 
 
 def main() -> int:
     """Execute the simple workflow example."""
-    # Define paths
-    workflow_file = Path(__file__).parent.parent / "arazzo" / "workflow.arazzo.yaml"
-    openapi_file = Path(__file__).parent.parent / "openapi" / "jsonplaceholder.openapi.yaml"
+    parser = argparse.ArgumentParser(description="Simple workflow example")
+    parser.add_argument(
+        "--user-id", type=int, nargs="+", default=[1], help="User ID(s) to fetch (1-10)"
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Also print the raw fetchUser step outputs as JSON"
+    )
+    args = parser.parse_args()
+    out = BufferedOutput()
     
-    print("=" * 60)
-    print("Arazzo Simple Workflow Example")
-    print("=" * 60)
-    print()
+    out.write("=" * 60)
+    out.write("Arazzo Simple Workflow Example")
+    out.write("=" * 60)
+    out.write()
     
     # Check files exist
-    if not workflow_file.exists():
-        print(f"❌ Error: Workflow file not found at {workflow_file}")
+    if not WORKFLOW_FILE.exists():
+        out.error(f"❌ Error: Workflow file not found at {WORKFLOW_FILE}")
         return 1
     
-    if not openapi_file.exists():
-        print(f"❌ Error: OpenAPI file not found at {openapi_file}")
+    if not OPENAPI_FILE.exists():
+        out.error(f"❌ Error: OpenAPI file not found at {OPENAPI_FILE}")
         return 1
     
     # Load files
-    print(f"📂 Loading workflow from: {workflow_file}")
+    out.write(f"📂 Loading workflow from: {WORKFLOW_FILE}")
     try:
-        with open(workflow_file) as f:
-            arazzo_doc = yaml.safe_load(f)
-        
-        with open(openapi_file) as f:
-            openapi_spec = yaml.safe_load(f)
+        arazzo_doc = load_yaml(WORKFLOW_FILE)
+        openapi_spec = load_yaml(OPENAPI_FILE)
         
         source_descriptions = {
             "jsonPlaceholderAPI": openapi_spec
         }
         
-        runner = ArazzoRunner(arazzo_doc, source_descriptions)
-        print("✅ Workflow loaded successfully")
-        print()
+        # The runners share one explicit session instead of each creating
+        # its own. Size its pool so each concurrent user keeps a connection
+        # alive instead of urllib3 discarding the extras once the default fills up.
+        http_client = requests.Session()
+        pool_size = max(len(args.user_id), DEFAULT_POOLSIZE)
+        http_client.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+        
+        # A runner is not safe to share between threads (execution IDs come
+        # from a counter), so each concurrent user gets its own runner
+        runners = [
+            ArazzoRunner(arazzo_doc, source_descriptions, http_client=http_client)
+            for _ in args.user_id
+        ]
+        out.write("✅ Workflow loaded successfully")
+        out.write()
     except Exception as e:
-        print(f"❌ Failed to load workflow: {e}")
+        out.error(f"❌ Failed to load workflow: {e}")
         return 1
     
     # Execute workflow
-    print("🚀 Executing workflow with userId=1...")
+    user_ids = args.user_id
+    out.write(f"🚀 Executing workflow with userId={', '.join(map(str, user_ids))}...")
     try:
-        execution_id = runner.start_workflow("getUserInfo", {"userId": 1})
+        # Executions are independent, so all users are fetched concurrently
+        with ThreadPoolExecutor(max_workers=len(user_ids)) as executor:
+            runs = list(executor.map(fetch_user, runners, user_ids))
         
-        # Execute steps
-        result = None
-        for _ in range(10):
-            result = runner.execute_next_step(execution_id)
-            if result["status"] == "workflow_complete":
-                break
+        for user_id, (result, _) in zip(user_ids, runs, strict=True):
+            if result["status"] != "workflow_complete":
+                out.error(f"❌ Workflow failed for userId={user_id}: {result.get('error')}")
+                return 1
         
-        if result["status"] == "workflow_complete":
-            print("✅ Workflow completed successfully")
-            print()
-            
-            state = runner.execution_states[execution_id]
-            user = state.step_outputs["fetchUser"]
+        out.write("✅ Workflow completed successfully")
+        out.write()
+        
+        for _, user in runs:
+            out.write("User Information:")
+            out.write("-" * 40)
+            out.write(f"  ID:       {user['userId']}")
+            out.write(f"  Name:     {user['name']}")
+            out.write(f"  Username: {user['username']}")
+            out.write(f"  Email:    {user['email']}")
+            out.write(f"  Phone:    {user['phone']}")
+            out.write(f"  Website:  {user['website']}")
+            out.write()
             
-            print("User Information:")
-            print("-" * 40)
-            print(f"  ID:       {user.get('userId')}")
-            print(f"  Name:     {user.get('name')}")
-            print(f"  Username: {user.get('username')}")
-            print(f"  Email:    {user.get('email')}")
-            print(f"  Phone:    {user.get('phone')}")
-            print(f"  Website:  {user.get('website')}")
-            print()
-        else:
-            print(f"❌ Workflow failed: {result.get('error')}")
-            return 1
+            if args.verbose:
+                out.write("fetchUser Step Outputs:")
+                out.write(dumps(user))
+                out.write()
             
     except Exception as e:
-        print(f"❌ Workflow execution failed: {e}")
+        out.error(f"❌ Workflow execution failed: {e}")
         return 1
     
-    print("=" * 60)
-    print("🎉 Example completed successfully!")
-    print("=" * 60)
+    out.write("=" * 60)
+    out.write("🎉 Example completed successfully!")
+    out.write("=" * 60)
+    out.flush()
     
     return 0
 
@@ -0,0 +1,123 @@
+"""
+Shared fixtures for the simple workflow tests.
+
+The specs are parsed and the runner is built once per test session, and
+API calls are answered from recorded responses unless a test is marked
+``real_api``.
+"""
+
+import json
+from pathlib import Path
+from typing import Final
+
+import pytest
+import requests
+import responses
+import yaml
+from arazzo_runner import ArazzoRunner
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+RECIPE_DIR: Final[Path] = Path(__file__).resolve().parent.parent
+WORKFLOW_FILE: Final[Path] = RECIPE_DIR / "arazzo" / "workflow.arazzo.yaml"
+OPENAPI_FILE: Final[Path] = RECIPE_DIR / "openapi" / "jsonplaceholder.openapi.yaml"
+USERS_FIXTURE: Final[Path] = RECIPE_DIR / "tests" / "fixtures" / "users.json"
+
+API_URL: Final[str] = "https://jsonplaceholder.typicode.com"
+
+
+def _load_yaml(path):
+    """Parse a YAML spec, using the libyaml-backed loader when available."""
+    with open(path) as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
+@pytest.fixture(scope="session")
+def canned_users():
+    """Recorded JSONPlaceholder user records, keyed by user ID."""
+    with open(USERS_FIXTURE) as f:
+        return {user["id"]: user for user in json.load(f)}
+
+
+@pytest.fixture(autouse=True)
+def mock_api(request, canned_users):
+    """Serve the user endpoints from ``canned_users`` instead of the network.
+
+    Tests marked ``real_api`` bypass the mock and call JSONPlaceholder.
+    """
+    if request.node.get_closest_marker("real_api"):
+        yield None
+        return
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        for user_id, user in canned_users.items():
+            rsps.get(f"{API_URL}/users/{user_id}", json=user)
+        rsps.get(f"{API_URL}/users/999", status=404, json={})
+        yield rsps
+
+
+@pytest.fixture(scope="session")
+def workflow_file():
+    """Path to the workflow file."""
+    return WORKFLOW_FILE
+
+
+@pytest.fixture(scope="session")
+def openapi_file():
+    """Path to the OpenAPI file."""
+    return OPENAPI_FILE
+
+
+@pytest.fixture(scope="session")
+def arazzo_doc(workflow_file):
+    """Load the Arazzo document once per test session."""
+    return _load_yaml(workflow_file)
+
+
+@pytest.fixture(scope="session")
+def openapi_spec(openapi_file):
+    """Load the OpenAPI specification once per test session."""
+    return _load_yaml(openapi_file)
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """Explicit HTTP session for the runner, closed when the test session ends.
+
+    The runner would otherwise create its own ``requests.Session``; passing
+    one in only makes it explicit and closeable.
+    """
+    with requests.Session() as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def runner(arazzo_doc, openapi_spec, http_session):
+    """Create an ArazzoRunner instance shared by the whole session.
+
+    Each test starts its own execution, and ``_reset_execution_states``
+    clears them again once the test finishes.
+    """
+    source_descriptions = {
+        "jsonPlaceholderAPI": openapi_spec
+    }
+    
+    return ArazzoRunner(arazzo_doc, source_descriptions, http_client=http_session)
+
+
+@pytest.fixture(autouse=True)
+def _reset_execution_states(request):
+    """Drop finished executions from the shared runner after each test.
+
+    The runner is built once per session, so without this its
+    ``execution_states`` would keep every execution the suite started.
+    Tests that need an execution's outputs later snapshot them first.
+    """
+    if "runner" not in request.fixturenames:
+        yield
+        return
+    runner = request.getfixturevalue("runner")
+    yield
+    runner.execution_states.clear()
@@ -1,41 +1,67 @@
 """Tests for the simple workflow recipe."""
 
-import yaml
+import copy
+import os
 import pytest
-from pathlib import Path
+from functools import cache
+from itertools import repeat
+from types import SimpleNamespace
+from typing import Final
 
-from arazzo_runner import ArazzoRunner
+from arazzo_runner.models import WorkflowExecutionStatus
 
+# Tests marked real_api only run when the live API is explicitly allowed
+NETWORK: Final[bool] = bool(os.environ.get("ARAZZO_TEST_NETWORK"))
 
-@pytest.fixture
-def workflow_file():
-    """Path to the workflow file."""
-    return Path(__file__).parent.parent / "arazzo" / "workflow.arazzo.yaml"
+# execute_next_step moves on to the next step after one raises, so a step
+# error has to end the drive just like the end of the workflow does.
+FAILURE_STATUSES = frozenset({WorkflowExecutionStatus.ERROR, WorkflowExecutionStatus.STEP_ERROR})
+TERMINAL_STATUSES = FAILURE_STATUSES | {WorkflowExecutionStatus.WORKFLOW_COMPLETE}
 
 
-@pytest.fixture
-def openapi_file():
-    """Path to the OpenAPI file."""
-    return Path(__file__).parent.parent / "openapi" / "jsonplaceholder.openapi.yaml"
+def drain_workflow(runner, execution_id, max_steps=32):
+    """Execute steps until the workflow reaches a terminal status.
 
+    Raises ``RuntimeError`` if it has not stopped after ``max_steps`` calls,
+    rather than looping forever on a workflow that never finishes.
+    """
+    results = map(runner.execute_next_step, repeat(execution_id, max_steps))
+    result = next(filter(lambda r: r["status"] in TERMINAL_STATUSES, results), None)
+    if result is None:
+        raise RuntimeError(f"workflow did not finish within {max_steps} steps")
+    return result
 
-@pytest.fixture
-def runner(workflow_file, openapi_file):
-    """Create an ArazzoRunner instance."""
-    # Load the Arazzo document
-    with open(workflow_file) as f:
-        arazzo_doc = yaml.safe_load(f)
-    
-    # Load the OpenAPI specification
-    with open(openapi_file) as f:
-        openapi_spec = yaml.safe_load(f)
-    
-    # Create source descriptions dict
-    source_descriptions = {
-        "jsonPlaceholderAPI": openapi_spec
-    }
-    
-    return ArazzoRunner(arazzo_doc, source_descriptions)
+
+@cache
+def _cached_run(runner, workflow_id, inputs):
+    """Execute a workflow and snapshot its result.
+
+    ``inputs`` is a sorted tuple of items so it can be part of the cache
+    key. The workflow only issues an idempotent GET against a read-only
+    API, so identical inputs always produce the same snapshot.
+    """
+    execution_id = runner.start_workflow(workflow_id, dict(inputs))
+    result = drain_workflow(runner, execution_id)
+    state = runner.execution_states[execution_id]
+    return SimpleNamespace(result=result, step_outputs=dict(state.step_outputs))
+
+
+def run_cached(runner, workflow_id, inputs):
+    """Return the snapshot for ``(workflow_id, inputs)``, executing it at most once.
+
+    The snapshot is deep-copied so a test that mutates it cannot affect
+    the cached value seen by other tests. Set ``JENTIC_NO_CACHE`` to
+    execute every call against the API instead.
+    """
+    key = tuple(sorted(inputs.items()))
+    if os.environ.get("JENTIC_NO_CACHE"):
+        return _cached_run.__wrapped__(runner, workflow_id, key)
+    return copy.deepcopy(_cached_run(runner, workflow_id, key))
+
+
+def get_user(runner, user_id):
+    """Run getUserInfo for ``user_id`` and return the fetchUser step outputs."""
+    return run_cached(runner, "getUserInfo", {"userId": user_id}).step_outputs["fetchUser"]
 
 
 def test_workflow_file_exists(workflow_file):
@@ -56,103 +82,83 @@ def test_workflow_loads_successfully(runner):
 
 def test_successful_execution(runner):
     """Test successful workflow execution with valid input."""
-    execution_id = runner.start_workflow("getUserInfo", {"userId": 1})
-    
-    # Execute all steps
-    result = None
-    for _ in range(10):  # Max 10 steps
-        result = runner.execute_next_step(execution_id)
-        if result["status"] == "workflow_complete":
-            break
+    run = run_cached(runner, "getUserInfo", {"userId": 1})
     
-    assert result["status"] == "workflow_complete"
-    
-    # Get the execution state
-    state = runner.execution_states[execution_id]
-    assert "fetchUser" in state.step_outputs
+    assert run.result["status"] == "workflow_complete"
+    assert "fetchUser" in run.step_outputs
     
-    user = state.step_outputs["fetchUser"]
+    user = run.step_outputs["fetchUser"]
     assert user.get("userId") == 1
     assert user.get("username") is not None
     assert user.get("email") is not None
 
 
 def test_execution_with_different_users(runner):
-    """Test execution with multiple user IDs."""
+    """Test execution with multiple user IDs.
+
+    The executions run one at a time: ``ArazzoRunner.start_workflow`` derives
+    execution IDs from ``len(execution_states)``, so concurrent starts on the
+    shared runner can collide.
+    """
     user_ids = [1, 2, 3, 5, 10]
     
     for user_id in user_ids:
-        execution_id = runner.start_workflow("getUserInfo", {"userId": user_id})
+        run = run_cached(runner, "getUserInfo", {"userId": user_id})
         
-        result = None
-        for _ in range(10):
-            result = runner.execute_next_step(execution_id)
-            if result["status"] == "workflow_complete":
-                break
-        
-        assert result["status"] == "workflow_complete"
-        state = runner.execution_states[execution_id]
-        user = state.step_outputs["fetchUser"]
+        assert run.result["status"] == "workflow_complete"
+        user = run.step_outputs["fetchUser"]
         assert user.get("userId") == user_id
 
 
 def test_output_structure(runner):
     """Test that outputs have the expected structure."""
-    execution_id = runner.start_workflow("getUserInfo", {"userId": 1})
-    
-    result = None
-    for _ in range(10):
-        result = runner.execute_next_step(execution_id)
-        if result["status"] == "workflow_complete":
-            break
-    
-    state = runner.execution_states[execution_id]
-    user = state.step_outputs["fetchUser"]
+    user = get_user(runner, 1)
     
     # Check required fields
-    required_fields = ["userId", "username", "email", "name"]
-    for field in required_fields:
-        assert field in user, f"Missing required field: {field}"
+    missing = {"userId", "username", "email", "name"} - user.keys()
+    assert not missing, f"Missing required fields: {sorted(missing)}"
     
     # Check optional fields
-    optional_fields = ["phone", "website"]
-    for field in optional_fields:
-        assert field in user, f"Missing optional field: {field}"
+    missing = {"phone", "website"} - user.keys()
+    assert not missing, f"Missing optional fields: {sorted(missing)}"
 
 
-@pytest.mark.parametrize("user_id,expected_username", [
-    (1, "Bret"),
-    (2, "Antonette"),
-    (3, "Samantha"),
-])
-def test_known_users(runner, user_id, expected_username):
+def test_known_users(runner):
     """Test execution with known user IDs and verify usernames."""
-    execution_id = runner.start_workflow("getUserInfo", {"userId": user_id})
+    expected_usernames = {1: "Bret", 2: "Antonette", 3: "Samantha"}
     
-    result = None
-    for _ in range(10):
-        result = runner.execute_next_step(execution_id)
-        if result["status"] == "workflow_complete":
-            break
-    
-    state = runner.execution_states[execution_id]
-    user = state.step_outputs["fetchUser"]
-    assert user.get("username") == expected_username
+    for user_id, expected_username in expected_usernames.items():
+        user = get_user(runner, user_id)
+        assert user.get("username") == expected_username, f"userId={user_id}"
 
 
 def test_default_user_id(runner):
     """Test execution with explicitly provided default user ID."""
     # Explicitly provide the default value instead of relying on workflow defaults
+    run = run_cached(runner, "getUserInfo", {"userId": 1})
+    
+    # Should successfully fetch user 1
+    assert run.result["status"] == "workflow_complete"
+    user = run.step_outputs["fetchUser"]
+    assert user.get("userId") == 1
+
+
+def test_invalid_user_id(runner):
+    """Test that an unknown user ID does not complete the workflow."""
+    run = run_cached(runner, "getUserInfo", {"userId": 999})
+    
+    # The API answers 404, which fails the step's $statusCode == 200 criterion
+    assert run.result["status"] != "workflow_complete"
+
+
+@pytest.mark.real_api
+@pytest.mark.skipif(not NETWORK, reason="set ARAZZO_TEST_NETWORK=1 to call the live API")
+def test_live_api_smoke(runner):
+    """Smoke-test the workflow against the real JSONPlaceholder API."""
     execution_id = runner.start_workflow("getUserInfo", {"userId": 1})
     
-    result = None
-    for _ in range(10):
-        result = runner.execute_next_step(execution_id)
-        if result["status"] == "workflow_complete":
-            break
+    result = drain_workflow(runner, execution_id)
     
-    # Should successfully fetch user 1
     assert result["status"] == "workflow_complete"
-    state = runner.execution_states[execution_id]
-    user = state.step_outputs["fetchUser"]
-    assert user.get("userId") == 1
\ No newline at end of file
+    user = runner.execution_states[execution_id].step_outputs["fetchUser"]
+    assert user.get("username") == "Bret"
\ No newline at end of file